@@ -4,13 +4,6 @@ from __future__ import annotations
 
 import click
 
-from memorypack.config import PipelineConfig
-from memorypack.output.formatter import render_single
-from memorypack.output.stats import print_stats
-from memorypack.output.writer import write_output
-from memorypack.pipeline import run_pipeline
-from memorypack.tokencount import estimate_tokens
-
 
 @click.group()
 def cli() -> None:
@@ -35,6 +28,12 @@ def cli() -> None:
     default="cpu",
     help="Device for model inference.",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(["pt", "onnx", "torch.compile"]),
+    default="pt",
+    help="Inference backend for the embedding and summarization models.",
+)
 @click.option(
     "--compression-target",
     type=float,
@@ -53,30 +52,42 @@ def cli() -> None:
     default="Knowledge Base",
     help="Topic name for the output header.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Disable the on-disk embedding cache.",
+)
 def compress(
     inputs: tuple[str, ...],
     output_dir: str,
     fmt: str,
     device: str,
+    backend: str,
     compression_target: float,
     chunk_size: int,
     topic: str,
+    no_cache: bool,
 ) -> None:
     """Compress markdown files into context-efficient format for LLMs."""
+    from memorypack.config import PipelineConfig
+    from memorypack.output.stats import print_stats
+    from memorypack.output.writer import write_output
+    from memorypack.pipeline import run_pipeline
+
     config = PipelineConfig(
         chunk_size=chunk_size,
         device=device,
+        backend=backend,
         compression_target=compression_target,
         output_format=fmt,
         topic=topic,
     )
+    if no_cache:
+        config.embedding_cache_dir = None
 
     result = run_pipeline(list(inputs), config)
 
-    # Calculate output token count from the rendered content
-    rendered = render_single(result.output)
-    result.output.output_token_count = estimate_tokens(rendered)
-
     # Write to disk
     written = write_output(result.output, output_dir, fmt)
 
@@ -146,6 +157,7 @@ def prune(
     from rich.table import Table
 
     from memorypack.config import PruneConfig
+    from memorypack.output.formatter import render_single
     from memorypack.pruning.parser import parse_knowledge_base
     from memorypack.pruning.pruner import prune as run_prune
 
@@ -210,7 +222,7 @@ def prune(
     "--interval",
     type=int,
     default=60,
-    help="Polling interval in seconds.",
+    help="Polling interval in seconds (used when watchdog is not installed).",
 )
 @click.option(
     "--token-budget",
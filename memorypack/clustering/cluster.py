@@ -2,45 +2,111 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Callable
+
 import numpy as np
-from sklearn.cluster import SpectralClustering
+from scipy.linalg import eigh
+from scipy.sparse.csgraph import connected_components, laplacian
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.manifold import spectral_embedding
 from sklearn.metrics import silhouette_score
 
 from memorypack.config import PipelineConfig
 from memorypack.models import Chunk, Cluster
 
+# Up to this many chunks, a dense eigendecomposition is cheap and k is picked
+# by eigengap; above it, k is picked by a silhouette sweep.
+_EIGENGAP_MAX_N = 200
 
-def _select_k(affinity: np.ndarray, min_k: int, max_k: int) -> int:
-    """Select optimal number of clusters using silhouette score."""
-    n = affinity.shape[0]
-    max_k = min(max_k, n - 1)  # can't have more clusters than samples - 1
+_HEADING_RE = re.compile(r"#+\s+(.+?)(?:\s+#|\.|$)", re.MULTILINE)
+
+
+def _spectral_embedding(affinity: np.ndarray, n_components: int) -> np.ndarray:
+    """Embed the affinity graph via its normalized Laplacian eigenvectors.
+
+    The eigenvectors do not depend on k, so this is computed once for the
+    largest candidate k and sliced for smaller ones.
+    """
+    return spectral_embedding(
+        affinity,
+        n_components=n_components,
+        random_state=42,
+        drop_first=False,
+    )
+
+
+def _laplacian_eigenmap(
+    affinity: np.ndarray, n_components: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Smallest normalized Laplacian eigenvalues and the matching embedding.
+
+    Dense counterpart of _spectral_embedding for small graphs, which also
+    exposes the eigenvalues for the eigengap heuristic.
+    """
+    lap, dd = laplacian(affinity, normed=True, return_diag=True)
+    eigenvalues, eigenvectors = eigh(lap, subset_by_index=[0, n_components - 1])
+    return eigenvalues, eigenvectors / dd[:, np.newaxis]
+
+
+def _eigengap_k(eigenvalues: np.ndarray, min_k: int, max_k: int) -> int:
+    """Pick k where the gap between consecutive eigenvalues is largest."""
     if max_k <= min_k:
         return min_k
+    gaps = np.diff(eigenvalues[: max_k + 1])
+    return int(np.argmax(gaps[min_k - 1 : max_k])) + min_k
+
+
+def _assign_labels(embedding: np.ndarray, k: int) -> np.ndarray:
+    """Run KMeans on the first k spectral components."""
+    km = KMeans(n_clusters=k, n_init=10, random_state=42)
+    return km.fit_predict(embedding[:, :k])
+
+
+def _kmeans_labels(embeddings: np.ndarray, k: int) -> np.ndarray:
+    """Cluster the raw embeddings directly, bypassing the affinity graph."""
+    km = MiniBatchKMeans(n_clusters=k, n_init=3, random_state=42)
+    return km.fit_predict(embeddings)
+
+
+def _select_k(
+    embedding: np.ndarray,
+    distance: np.ndarray,
+    min_k: int,
+    max_k: int,
+    assign: Callable[[np.ndarray, int], np.ndarray] = _assign_labels,
+) -> tuple[int, np.ndarray]:
+    """Select optimal number of clusters using silhouette score.
+
+    Returns the chosen k together with its labels so the caller does not
+    need to fit again.
+    """
+    n = distance.shape[0]
+    max_k = min(max_k, n - 1)  # can't have more clusters than samples - 1
+    if max_k <= min_k:
+        return min_k, assign(embedding, min_k)
 
     best_k = min_k
+    best_labels: np.ndarray | None = None
     best_score = -1.0
 
     for k in range(min_k, max_k + 1):
         try:
-            sc = SpectralClustering(
-                n_clusters=k,
-                affinity="precomputed",
-                assign_labels="kmeans",
-                random_state=42,
-                n_init=10,
-            )
-            labels = sc.fit_predict(affinity)
+            labels = assign(embedding, k)
             # Need at least 2 unique labels for silhouette
             if len(set(labels)) < 2:
                 continue
-            score = silhouette_score(affinity, labels, metric="precomputed")
+            score = silhouette_score(distance, labels, metric="precomputed")
             if score > best_score:
                 best_score = score
                 best_k = k
+                best_labels = labels
         except Exception:
             continue
 
-    return best_k
+    if best_labels is None:
+        best_labels = assign(embedding, best_k)
+    return best_k, best_labels
 
 
 def _generate_label(chunks: list[Chunk]) -> str:
@@ -48,13 +114,10 @@ def _generate_label(chunks: list[Chunk]) -> str:
 
     Looks for markdown headings first, then falls back to first words.
     """
-    import re
-    # Look for headings in chunk text
+    # Look for headings in chunk text, stopping at the first usable one
     for chunk in chunks:
-        # Find markdown headings
-        matches = re.findall(r"#+\s+(.+?)(?:\s+#|\.|$)", chunk.text)
-        for label in matches:
-            label = label.strip()
+        for match in _HEADING_RE.finditer(chunk.text):
+            label = match.group(1).strip()
             # Only use if it looks like a heading (short, title-like)
             if 5 < len(label) < 50 and label[0].isupper():
                 return label
@@ -77,8 +140,14 @@ def cluster_chunks(
     chunks: list[Chunk],
     similarity_matrix: np.ndarray,
     config: PipelineConfig,
+    embeddings: np.ndarray | None = None,
 ) -> list[Cluster]:
-    """Cluster chunks using spectral clustering."""
+    """Cluster chunks using spectral clustering.
+
+    If the affinity graph falls apart into disconnected pieces the spectral
+    embedding degenerates, so when embeddings are given those are clustered
+    with KMeans directly instead.
+    """
     n = len(chunks)
 
     if n <= 2:
@@ -88,23 +157,27 @@ def cluster_chunks(
             c.cluster_id = 0
         return [cluster]
 
-    # Convert similarity to affinity (ensure non-negative)
-    affinity = np.clip(similarity_matrix, 0, 1)
+    # Convert similarity to affinity (ensure non-negative), upcasting the
+    # half-precision similarity matrix for the solvers
+    affinity = similarity_matrix.astype(np.float32)
+    np.clip(affinity, 0, 1, out=affinity)
     np.fill_diagonal(affinity, 1.0)
 
-    # For silhouette with precomputed, we need distance matrix
-    distance_matrix = 1 - affinity
-
-    k = _select_k(distance_matrix, config.min_clusters, min(config.max_clusters, n - 1))
-
-    sc = SpectralClustering(
-        n_clusters=k,
-        affinity="precomputed",
-        assign_labels="kmeans",
-        random_state=42,
-        n_init=10,
-    )
-    labels = sc.fit_predict(affinity)
+    min_k = config.min_clusters
+    max_k = min(config.max_clusters, n - 1)
+    n_components, _ = connected_components(affinity > 0, directed=False)
+    if embeddings is not None and n_components > 1:
+        _, labels = _select_k(
+            embeddings, 1 - affinity, min_k, max_k, assign=_kmeans_labels
+        )
+    elif n <= _EIGENGAP_MAX_N:
+        eigenvalues, embedding = _laplacian_eigenmap(affinity, max(max_k, min_k) + 1)
+        labels = _assign_labels(embedding, _eigengap_k(eigenvalues, min_k, max_k))
+    else:
+        # For silhouette with precomputed, we need distance matrix
+        distance_matrix = 1 - affinity
+        embedding = _spectral_embedding(affinity, max(max_k, min_k))
+        _, labels = _select_k(embedding, distance_matrix, min_k, max_k)
 
     # Build Cluster objects
     cluster_map: dict[int, list[Chunk]] = {}
@@ -1,61 +1,40 @@
-"""Union-find based deduplication of near-identical chunks."""
+"""Connected-component based deduplication of near-identical chunks."""
 
 from __future__ import annotations
 
 import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 from memorypack.models import Chunk
 
 
-class UnionFind:
-    """Simple union-find / disjoint-set structure."""
-
-    def __init__(self, n: int) -> None:
-        self.parent = list(range(n))
-        self.rank = [0] * n
-
-    def find(self, x: int) -> int:
-        while self.parent[x] != x:
-            self.parent[x] = self.parent[self.parent[x]]
-            x = self.parent[x]
-        return x
-
-    def union(self, x: int, y: int) -> None:
-        rx, ry = self.find(x), self.find(y)
-        if rx == ry:
-            return
-        if self.rank[rx] < self.rank[ry]:
-            rx, ry = ry, rx
-        self.parent[ry] = rx
-        if self.rank[rx] == self.rank[ry]:
-            self.rank[rx] += 1
-
-
 def deduplicate(
     chunks: list[Chunk], similarity_matrix: np.ndarray, threshold: float = 0.92
 ) -> list[Chunk]:
     """Mark near-duplicate chunks. Returns only unique chunks.
 
-    Uses union-find to group duplicates, keeps the one with most tokens.
+    Groups duplicates as connected components of the thresholded
+    similarity graph, keeps the one with most tokens.
     """
     n = len(chunks)
-    uf = UnionFind(n)
+    if n == 0:
+        return []
 
-    # Find pairs above threshold
-    for i in range(n):
-        for j in range(i + 1, n):
-            if similarity_matrix[i, j] >= threshold:
-                uf.union(i, j)
+    # Edges between pairs above threshold (upper triangle is enough for an
+    # undirected graph)
+    adjacency = csr_matrix(np.triu(similarity_matrix >= threshold, k=1))
+    _n_groups, labels = connected_components(adjacency, directed=False)
 
-    # Group by root
-    groups: dict[int, list[int]] = {}
-    for i in range(n):
-        root = uf.find(i)
-        groups.setdefault(root, []).append(i)
+    # Group indices by component, ascending index within each group
+    order = np.argsort(labels, kind="stable")
+    _, starts = np.unique(labels[order], return_index=True)
+    groups = np.split(order, starts[1:])
 
     # Keep the longest chunk in each group, mark others as duplicates
     unique: list[Chunk] = []
-    for indices in groups.values():
+    for indices in groups:
+        indices = indices.tolist()
         # Pick the chunk with the most tokens as representative
         best = max(indices, key=lambda i: chunks[i].token_count)
         for i in indices:
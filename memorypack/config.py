@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 
 
 @dataclass
@@ -12,9 +13,16 @@ class PipelineConfig:
     # Chunking
     chunk_size: int = 512  # target tokens per chunk
 
+    # Inference
+    device: str = "cpu"  # cpu | cuda | mps
+    backend: str = "pt"  # pt | onnx | torch.compile
+    onnx_cache_dir: str = "~/.cache/memorypack/onnx"  # exported ONNX models
+
     # Embedding
     embedding_model: str = "all-MiniLM-L6-v2"
-    device: str = "cpu"  # cpu | cuda | mps
+    embedding_batch_size: int = 64  # texts per encoder forward pass
+    similarity_dtype: str = "float32"  # float32 | float16 (GPU only)
+    embedding_cache_dir: str | None = "~/.cache/memorypack/embeddings"  # None = off
 
     # Deduplication
     dedup_threshold: float = 0.92  # cosine similarity threshold
@@ -27,12 +35,18 @@ class PipelineConfig:
     summarization_model: str = "facebook/bart-large-cnn"
     summary_max_tokens: int = 150  # per-cluster summary length
     overview_max_tokens: int = 250  # meta-summary length
+    summary_batch_size: int = 8  # inputs per summarizer forward pass
+    hierarchical_full_reduce: bool = False  # re-segment, not truncate, long merges
 
     # Output
     compression_target: float = 6.0  # target compression ratio
     output_format: str = "single"  # single | multi
     topic: str = "Knowledge Base"
 
+    def onnx_model_dir(self, model_id: str) -> Path:
+        """Where the ONNX export of model_id is saved and reloaded from."""
+        return Path(self.onnx_cache_dir).expanduser() / model_id.replace("/", "--")
+
 
 @dataclass
 class PruneConfig:
@@ -45,3 +59,4 @@ class PruneConfig:
     dry_run: bool = False  # print plan without modifying
     device: str = "cpu"  # cpu | cuda | mps
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_batch_size: int = 64  # texts per encoder forward pass
@@ -0,0 +1,76 @@
+"""On-disk embedding cache keyed by chunk content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from memorypack.config import PipelineConfig
+
+_SQLITE_MAX_VARS = 500  # stay well under SQLite's bound-parameter limit
+
+
+class EmbeddingCache:
+    """SQLite-backed map from (model, chunk text) to its embedding vector."""
+
+    def __init__(self, cache_dir: Path, model_id: str) -> None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model_id = model_id
+        self._conn = sqlite3.connect(str(cache_dir / "cache.sqlite"))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+
+    def _key(self, text: str) -> str:
+        # Model id is part of the key so switching models never reuses vectors
+        data = self.model_id.encode() + b"\0" + text.encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def get_many(self, texts: list[str]) -> tuple[dict[int, np.ndarray], list[int]]:
+        """Look up texts, returning {index: vector} hits and missed indices."""
+        keys = [self._key(t) for t in texts]
+        found: dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), _SQLITE_MAX_VARS):
+            batch = keys[start : start + _SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                batch,
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+
+        hits: dict[int, np.ndarray] = {}
+        misses: list[int] = []
+        for i, key in enumerate(keys):
+            if key in found:
+                hits[i] = found[key]
+            else:
+                misses.append(i)
+        return hits, misses
+
+    def put_many(self, texts: list[str], vectors: np.ndarray) -> None:
+        """Write vectors for the given texts."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = [(self._key(t), v.tobytes()) for t, v in zip(texts, vectors)]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_embedding_cache(config: PipelineConfig) -> EmbeddingCache | None:
+    """Open the cache configured for this pipeline, or None if disabled."""
+    if not config.embedding_cache_dir:
+        return None
+    return EmbeddingCache(
+        Path(config.embedding_cache_dir).expanduser(), config.embedding_model
+    )
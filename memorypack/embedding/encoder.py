@@ -3,29 +3,119 @@
 from __future__ import annotations
 
 import numpy as np
+import torch
+from scipy.linalg.blas import ssyrk
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from memorypack.config import PipelineConfig
+from memorypack.modelcache import ModelCache
 from memorypack.models import Chunk
 
+_SYRK_MIN_ROWS = 2048  # below this, plain GEMM is as fast as SYRK + mirroring
+_SYRK_BLOCK = 256
+
+_encoders: ModelCache[SentenceTransformer] = ModelCache()
+
 
 def load_encoder(config: PipelineConfig) -> SentenceTransformer:
-    """Load the sentence-transformer model."""
-    return SentenceTransformer(config.embedding_model, device=config.device)
+    """Return the configured sentence-transformer, reusing a loaded one."""
+    key = (config.embedding_model, config.device, config.backend)
+    return _encoders.get(key, lambda: _load_encoder(config))
+
+
+def _load_encoder(config: PipelineConfig) -> SentenceTransformer:
+    """Load the sentence-transformer model on the configured backend.
+
+    "onnx" runs it under ONNX Runtime (needs the onnx extra), exporting on
+    first use and reloading the saved export afterwards. "torch.compile"
+    compiles the transformer's forward pass, paid once on the first batch.
+    """
+    if config.backend == "onnx":
+        model_dir = config.onnx_model_dir(config.embedding_model)
+        if model_dir.exists():
+            return SentenceTransformer(str(model_dir), device=config.device, backend="onnx")
+        model = SentenceTransformer(
+            config.embedding_model, device=config.device, backend="onnx"
+        )
+        model.save(str(model_dir))
+        return model
+
+    model = SentenceTransformer(config.embedding_model, device=config.device)
+    if config.backend == "torch.compile":
+        # Chunk lengths vary per batch; dynamic shapes avoid recompiling
+        auto_model = model[0].auto_model
+        auto_model.forward = torch.compile(auto_model.forward, dynamic=True)
+    return model
 
 
 def encode_chunks(
-    chunks: list[Chunk], model: SentenceTransformer
+    chunks: list[Chunk], model: SentenceTransformer, batch_size: int = 64
 ) -> np.ndarray:
-    """Compute embeddings for all chunks, returning (N, 384) array."""
+    """Compute unit-norm embeddings for all chunks, returning (N, 384) array.
+
+    Row i belongs to chunks[i]; the array is the only copy of the vectors.
+
+    All texts go through a single encode call; sentence-transformers sorts
+    them by length internally so each batch carries minimal padding.
+    """
     texts = [c.text for c in chunks]
-    embeddings = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-    for chunk, emb in zip(chunks, embeddings):
-        chunk.embedding = emb.tolist()
-    return embeddings
+    return model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+
+
+def _gram(emb: np.ndarray) -> np.ndarray:
+    """Compute emb @ emb.T in float32, exploiting symmetry for large inputs.
+
+    SSYRK only computes the upper triangle (half the FLOPs of SGEMM); the
+    lower triangle is then mirrored block by block to stay cache friendly.
+    """
+    n = emb.shape[0]
+    if n < _SYRK_MIN_ROWS:
+        return emb @ emb.T
+
+    # emb.T is Fortran-contiguous, so BLAS reads it without a copy
+    gram = ssyrk(1.0, emb.T, trans=1)
+    for i in range(0, n, _SYRK_BLOCK):
+        j = i + _SYRK_BLOCK
+        gram[j:, i:j] = gram[i:j, j:].T
+        block = gram[i:j, i:j]
+        block += np.triu(block, 1).T
+    # Symmetric, so the transpose is the same matrix in C order
+    return gram.T
+
+
+def _accelerator_available(device: str) -> bool:
+    """Whether device names a GPU backend that torch can actually use."""
+    if device.startswith("cuda"):
+        return torch.cuda.is_available()
+    if device == "mps":
+        return torch.backends.mps.is_available()
+    return False
+
+
+def build_similarity_matrix(
+    embeddings: np.ndarray | torch.Tensor,
+    dtype: str = "float32",
+    device: str = "cpu",
+) -> np.ndarray:
+    """Compute the pairwise cosine similarity matrix as float16.
 
+    Expects unit-norm rows (as returned by encode_chunks). dtype="float16"
+    runs the product in half precision on GPU; on CPU it is float32 either way.
+    """
+    if _accelerator_available(device):
+        emb = torch.as_tensor(embeddings, device=device)
+        # Half-precision inputs run on tensor cores with float32 accumulation
+        emb = emb.half() if dtype == "float16" else emb.float()
+        return (emb @ emb.T).clamp_(-1.0, 1.0).half().cpu().numpy()
+    if isinstance(embeddings, torch.Tensor):
+        embeddings = embeddings.cpu().numpy()
 
-def build_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Compute pairwise cosine similarity matrix."""
-    return cosine_similarity(embeddings)
+    sim = _gram(np.asarray(embeddings, dtype=np.float32))
+    np.clip(sim, -1.0, 1.0, out=sim)
+    return sim.astype(np.float16)
@@ -0,0 +1,29 @@
+"""Process-wide cache of loaded models."""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ModelCache(Generic[T]):
+    """Loaded models keyed by (model, device, backend).
+
+    Values are weak: a model stays cached only while a caller (e.g. the
+    watcher) holds it, so one-shot runs free it as soon as they finish.
+    """
+
+    def __init__(self) -> None:
+        self._models: weakref.WeakValueDictionary[tuple[str, str, str], T] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def get(self, key: tuple[str, str, str], load: Callable[[], T]) -> T:
+        """Return the model cached under key, calling load() on a miss."""
+        model = self._models.get(key)
+        if model is None:
+            model = self._models[key] = load()
+        return model
@@ -23,7 +23,7 @@ class Chunk:
     text: str
     source_file: str
     token_count: int
-    embedding: list[float] | None = None
+    word_count: int | None = None  # words in text; None = not counted yet
     is_duplicate: bool = False
     cluster_id: int = -1
 
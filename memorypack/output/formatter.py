@@ -2,84 +2,104 @@
 
 from __future__ import annotations
 
+import io
 import json
 
 from memorypack.models import TieredOutput
+from memorypack.tokencount import count_words, words_to_tokens
 
+# Fixed words in render_single: "# Knowledge Base:" (3), the stats line
+# (13; each number renders as one word) and the three "## " section headings
+_SINGLE_TEMPLATE_WORDS = 3 + 13 + 2 * 3
 
-def render_single(output: TieredOutput) -> str:
-    """Render to a single markdown file."""
-    ratio = (
+
+def _compression_ratio(output: TieredOutput) -> float:
+    return (
         output.input_token_count / output.output_token_count
         if output.output_token_count > 0
         else 0
     )
 
-    lines: list[str] = []
-    lines.append(f"# Knowledge Base: {output.topic}")
-    lines.append(
+
+def _header(output: TieredOutput, ratio: float) -> str:
+    """Title and stats blockquote shared by both formats."""
+    return (
+        f"# Knowledge Base: {output.topic}\n"
         f"> Compressed by memorypack | {output.file_count} files | "
         f"{output.input_token_count:,} → {output.output_token_count:,} tokens "
-        f"({ratio:.1f}:1)"
+        f"({ratio:.1f}:1)\n"
     )
-    lines.append("")
+
+
+def render_single(output: TieredOutput) -> str:
+    """Render to a single markdown file."""
+    ratio = _compression_ratio(output)
+
+    buf = io.StringIO()
+    write = buf.write
+    write(_header(output, ratio))
+    write("\n")
 
     # Tier 1: Overview
-    lines.append("## Overview")
-    lines.append(output.overview)
-    lines.append("")
+    write(f"## Overview\n{output.overview}\n\n")
 
     # Tier 2: Topics with summaries
-    lines.append("## Topics")
+    write("## Topics\n")
     for cluster in output.clusters:
-        lines.append(f"### {cluster.label}")
-        lines.append(cluster.summary)
-        lines.append("")
+        write(f"### {cluster.label}\n{cluster.summary}\n\n")
 
     # Tier 3: Facts
-    lines.append("## Facts")
+    write("## Facts")
     for cluster in output.clusters:
         if cluster.facts:
-            lines.append(f"### {cluster.label}")
+            write(f"\n### {cluster.label}\n")
             for fact in cluster.facts:
-                lines.append(f"- {fact}")
-            lines.append("")
+                write(f"- {fact}\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
+
+
+def estimate_rendered_tokens(output: TieredOutput) -> int:
+    """Equal to estimate_tokens(render_single(output)), without rendering.
+
+    Every field sits between whitespace in the template, so the rendered
+    word count is the template's fixed words plus each field's own count.
+    """
+    words = (
+        _SINGLE_TEMPLATE_WORDS
+        + count_words(output.topic)
+        + count_words(output.overview)
+    )
+    for cluster in output.clusters:
+        label_words = count_words(cluster.label)
+        # "### label" heading and summary under Topics
+        words += 1 + label_words + count_words(cluster.summary)
+        if cluster.facts:
+            # "### label" heading and "- fact" bullets under Facts
+            words += 1 + label_words
+            words += sum(1 + count_words(fact) for fact in cluster.facts)
+    return words_to_tokens(words)
 
 
 def render_multi(output: TieredOutput) -> dict[str, str]:
     """Render to multiple files: overview.md, facts.md, index.json."""
-    ratio = (
-        output.input_token_count / output.output_token_count
-        if output.output_token_count > 0
-        else 0
-    )
+    ratio = _compression_ratio(output)
 
     # overview.md
-    overview_lines = [
-        f"# Knowledge Base: {output.topic}",
-        f"> Compressed by memorypack | {output.file_count} files | "
-        f"{output.input_token_count:,} → {output.output_token_count:,} tokens "
-        f"({ratio:.1f}:1)",
-        "",
-        "## Overview",
-        output.overview,
-        "",
-    ]
+    overview = io.StringIO()
+    overview.write(_header(output, ratio))
+    overview.write(f"\n## Overview\n{output.overview}\n")
     for cluster in output.clusters:
-        overview_lines.append(f"### {cluster.label}")
-        overview_lines.append(cluster.summary)
-        overview_lines.append("")
+        overview.write(f"\n### {cluster.label}\n{cluster.summary}\n")
 
     # facts.md
-    facts_lines = [f"# Facts: {output.topic}", ""]
+    facts = io.StringIO()
+    facts.write(f"# Facts: {output.topic}\n")
     for cluster in output.clusters:
         if cluster.facts:
-            facts_lines.append(f"## {cluster.label}")
+            facts.write(f"\n## {cluster.label}\n")
             for fact in cluster.facts:
-                facts_lines.append(f"- {fact}")
-            facts_lines.append("")
+                facts.write(f"- {fact}\n")
 
     # index.json
     index = {
@@ -99,7 +119,7 @@ def render_multi(output: TieredOutput) -> dict[str, str]:
     }
 
     return {
-        "overview.md": "\n".join(overview_lines),
-        "facts.md": "\n".join(facts_lines),
+        "overview.md": overview.getvalue(),
+        "facts.md": facts.getvalue(),
         "index.json": json.dumps(index, indent=2),
     }
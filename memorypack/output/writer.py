@@ -7,6 +7,10 @@ from pathlib import Path
 from memorypack.models import TieredOutput
 from memorypack.output.formatter import render_multi, render_single
 
+SINGLE_FILENAME = "knowledge_base.md"
+# Every file write_output can produce, across both formats
+OUTPUT_FILENAMES = (SINGLE_FILENAME, "overview.md", "facts.md", "index.json")
+
 
 def write_output(output: TieredOutput, output_dir: str, fmt: str = "single") -> list[str]:
     """Write compressed output to disk. Returns list of written file paths."""
@@ -23,7 +27,7 @@ def write_output(output: TieredOutput, output_dir: str, fmt: str = "single") ->
             written.append(str(fpath))
     else:
         content = render_single(output)
-        fpath = out_path / "knowledge_base.md"
+        fpath = out_path / SINGLE_FILENAME
         fpath.write_text(content, encoding="utf-8")
         written.append(str(fpath))
 
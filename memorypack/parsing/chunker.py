@@ -2,76 +2,119 @@
 
 from __future__ import annotations
 
+import threading
+from pathlib import Path
+
 import nltk
+from nltk.tokenize.punkt import PunktTokenizer
 
 from memorypack.models import Chunk
-from memorypack.tokencount import estimate_tokens
+from memorypack.parsing.cleaner import clean_markdown
+from memorypack.parsing.reader import read_file
+from memorypack.tokencount import count_words, estimate_tokens, words_to_tokens
+
+_sentence_tokenizer: PunktTokenizer | None = None
+_sentence_tokenizer_lock = threading.Lock()
+
+
+def load_sentence_tokenizer() -> PunktTokenizer:
+    """Load the Punkt model once per process and reuse it; thread-safe."""
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        with _sentence_tokenizer_lock:
+            if _sentence_tokenizer is None:
+                nltk.download("punkt_tab", quiet=True)
+                _sentence_tokenizer = PunktTokenizer("english")
+    return _sentence_tokenizer
 
-_nltk_ready = False
 
+def init_worker_tokenizer() -> None:
+    """Process pool initializer: build the Punkt model without downloading.
 
-def _ensure_nltk() -> None:
-    global _nltk_ready
-    if not _nltk_ready:
-        nltk.download("punkt_tab", quiet=True)
-        _nltk_ready = True
+    The parent has already fetched the data via load_sentence_tokenizer,
+    so workers skip nltk.download and its network index check.
+    """
+    global _sentence_tokenizer
+    _sentence_tokenizer = PunktTokenizer("english")
 
 
 def _split_sentences(text: str) -> list[str]:
     """Split text into sentences using NLTK."""
-    _ensure_nltk()
-    return nltk.sent_tokenize(text)
+    return load_sentence_tokenizer().tokenize(text)
 
 
 def chunk_text(
     text: str, source_file: str, target_tokens: int = 512, start_id: int = 0
 ) -> list[Chunk]:
-    """Split text into chunks of approximately target_tokens at sentence boundaries."""
+    """Split text into chunks of approximately target_tokens at sentence boundaries.
+
+    Each sentence is word-counted once; a flushed chunk's token count is
+    derived from the running word total rather than re-counting its text.
+    """
     paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
     chunks: list[Chunk] = []
     current_sentences: list[str] = []
     current_tokens = 0
+    current_words = 0
     chunk_id = start_id
 
     for para in paragraphs:
         # Check if this is a heading — keep it attached to next content
         if para.startswith("#"):
+            para_words = count_words(para)
             current_sentences.append(para)
-            current_tokens += estimate_tokens(para)
+            current_tokens += words_to_tokens(para_words)
+            current_words += para_words
             continue
 
         sentences = _split_sentences(para)
         for sentence in sentences:
-            sent_tokens = estimate_tokens(sentence)
+            sent_words = count_words(sentence)
+            sent_tokens = words_to_tokens(sent_words)
 
             if current_tokens + sent_tokens > target_tokens and current_sentences:
                 # Flush current chunk
-                chunk_text_str = " ".join(current_sentences)
                 chunks.append(
                     Chunk(
                         id=chunk_id,
-                        text=chunk_text_str,
+                        text=" ".join(current_sentences),
                         source_file=source_file,
-                        token_count=estimate_tokens(chunk_text_str),
+                        token_count=words_to_tokens(current_words),
+                        word_count=current_words,
                     )
                 )
                 chunk_id += 1
                 current_sentences = []
                 current_tokens = 0
+                current_words = 0
 
             current_sentences.append(sentence)
             current_tokens += sent_tokens
+            current_words += sent_words
 
     # Flush remaining
     if current_sentences:
-        chunk_text_str = " ".join(current_sentences)
         chunks.append(
             Chunk(
                 id=chunk_id,
-                text=chunk_text_str,
+                text=" ".join(current_sentences),
                 source_file=source_file,
-                token_count=estimate_tokens(chunk_text_str),
+                token_count=words_to_tokens(current_words),
+                word_count=current_words,
             )
         )
 
     return chunks
+
+
+def read_and_chunk(path: Path, target_tokens: int = 512) -> tuple[int, list[Chunk]]:
+    """Read, clean and chunk one file, numbering chunks from 0.
+
+    Returns the estimated token count of the file's body alongside its
+    chunks; the body itself is dropped once chunked. Lives at module
+    level, away from the model imports, so process pool workers can
+    unpickle it cheaply.
+    """
+    body = read_file(path).body
+    input_tokens = estimate_tokens(body)
+    return input_tokens, chunk_text(clean_markdown(body), str(path), target_tokens)
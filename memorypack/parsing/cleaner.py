@@ -4,11 +4,18 @@ from __future__ import annotations
 
 import re
 
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_MULTI_SPACE_RE = re.compile(r"  +")
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_REF_LINK_RE = re.compile(r"^\[.+?\]:\s+\S+.*$", re.MULTILINE)
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_HRULE_RE = re.compile(r"^[-*_]{3,}\s*$", re.MULTILINE)
+
 
 def clean_markdown(text: str) -> str:
     """Normalize markdown while preserving semantic structure."""
     # Collapse multiple blank lines to single
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
 
     # Normalize whitespace within lines (but preserve newlines)
     lines = []
@@ -17,24 +24,25 @@ def clean_markdown(text: str) -> str:
         line = line.rstrip()
         # Collapse multiple spaces (but not leading indentation)
         stripped = line.lstrip()
-        indent = line[: len(line) - len(stripped)]
-        stripped = re.sub(r"  +", " ", stripped)
-        lines.append(indent + stripped)
+        if "  " in stripped:
+            indent = line[: len(line) - len(stripped)]
+            line = indent + _MULTI_SPACE_RE.sub(" ", stripped)
+        lines.append(line)
     text = "\n".join(lines)
 
     # Remove HTML comments
-    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
+    text = _HTML_COMMENT_RE.sub("", text)
 
     # Normalize link references to inline form isn't needed — just strip ref defs
     # Remove reference-style link definitions
-    text = re.sub(r"^\[.+?\]:\s+\S+.*$", "", text, flags=re.MULTILINE)
+    text = _REF_LINK_RE.sub("", text)
 
     # Remove images (keep alt text)
-    text = re.sub(r"!\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = _IMAGE_RE.sub(r"\1", text)
 
     # Simplify horizontal rules
-    text = re.sub(r"^[-*_]{3,}\s*$", "---", text, flags=re.MULTILINE)
+    text = _HRULE_RE.sub("---", text)
 
-    # Strip trailing whitespace and collapse blank lines again
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    # Removed comments and ref defs can leave new runs of blank lines
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
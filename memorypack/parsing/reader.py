@@ -2,12 +2,41 @@
 
 from __future__ import annotations
 
+import mmap
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import frontmatter
 
 from memorypack.models import SourceFile
 
+_MMAP_MIN_BYTES = 1 << 20
+
+# Leading delimiters of the YAML, TOML and JSON frontmatter formats
+_FRONTMATTER_OPENERS = ("---", "+++", "{", "}")
+
+
+def _walk_md(root: str) -> Iterator[str]:
+    """Yield paths of .md files under root, trusting cached dirent types.
+
+    Unreadable directories are skipped, as rglob does.
+    """
+    try:
+        it = os.scandir(root)
+    except PermissionError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                yield from _walk_md(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path
+
 
 def discover_files(paths: list[str]) -> list[Path]:
     """Resolve a list of paths/globs into .md file paths."""
@@ -17,13 +46,34 @@ def discover_files(paths: list[str]) -> list[Path]:
         if path.is_file() and path.suffix == ".md":
             results.append(path)
         elif path.is_dir():
-            results.extend(sorted(path.rglob("*.md")))
+            results.extend(sorted(map(Path, _walk_md(str(path)))))
     return results
 
 
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 file, decoding large ones straight from a memory map.
+
+    Decoding from the map skips the intermediate bytes copy that
+    read_text makes, which lowers peak memory on very large files.
+    """
+    if path.stat().st_size < _MMAP_MIN_BYTES:
+        return path.read_text(encoding="utf-8")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = str(mm, "utf-8")
+    # Match read_text's universal newline translation
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def read_file(path: Path) -> SourceFile:
     """Read a markdown file, stripping frontmatter."""
-    raw = path.read_text(encoding="utf-8")
+    raw = _read_text(path)
+    body = raw.strip()
+    if not body.startswith(_FRONTMATTER_OPENERS):
+        # No frontmatter delimiter, so skip the parser entirely
+        return SourceFile(path=str(path), raw_content=raw, metadata={}, body=body)
+
     post = frontmatter.loads(raw)
     return SourceFile(
         path=str(path),
@@ -32,8 +82,3 @@ def read_file(path: Path) -> SourceFile:
         body=post.content,
     )
 
-
-def read_files(paths: list[str]) -> list[SourceFile]:
-    """Discover and read all markdown files from the given paths."""
-    file_paths = discover_files(paths)
-    return [read_file(p) for p in file_paths]
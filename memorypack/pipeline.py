@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from itertools import repeat
+from pathlib import Path
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -17,26 +23,138 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from memorypack.clustering.cluster import cluster_chunks
 from memorypack.clustering.dedup import deduplicate
 from memorypack.config import PipelineConfig
+from memorypack.embedding.cache import EmbeddingCache, open_embedding_cache
 from memorypack.embedding.encoder import (
     build_similarity_matrix,
     encode_chunks,
     load_encoder,
 )
-from memorypack.models import PipelineResult, TieredOutput
-from memorypack.parsing.chunker import chunk_text
-from memorypack.parsing.cleaner import clean_markdown
-from memorypack.parsing.reader import read_files
+from memorypack.models import Chunk, PipelineResult, TieredOutput
+from memorypack.output.formatter import estimate_rendered_tokens
+from memorypack.parsing.chunker import (
+    init_worker_tokenizer,
+    load_sentence_tokenizer,
+    read_and_chunk,
+)
+from memorypack.parsing.reader import discover_files
 from memorypack.summarization.fact_extractor import extract_facts
 from memorypack.summarization.summarizer import (
+    batch_summarize_clusters,
     generate_overview,
     load_summarizer,
-    summarize_cluster,
 )
-from memorypack.tokencount import estimate_tokens
 
 
-def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResult:
-    """Execute the full compression pipeline."""
+# Below these sizes process startup and pickling cost more than they save
+_MIN_PARALLEL_FILES = 3
+_MIN_PARALLEL_BYTES = 16 << 20
+_MAX_READ_THREADS = 32
+
+# Started on first use and kept for the life of the process, so repeated
+# runs (e.g. from the watcher) don't pay worker startup again
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared chunking pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawn, not fork: this process already runs threads (rich's
+        # refresh thread, the watcher's observer)
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 1) - 1),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker_tokenizer,
+        )
+    return _process_pool
+
+
+def _ingest_files(file_paths: list[Path], chunk_size: int) -> tuple[int, list[Chunk]]:
+    """Read, clean and chunk every file; returns (input tokens, chunks).
+
+    Each file is handled start to finish by one worker, which returns only
+    its chunks, so source text never piles up in this process. Cleaning
+    and sentence splitting are pure-Python CPU work, so large inputs go to
+    worker processes; otherwise threads still overlap the disk reads.
+    Chunk ids are assigned after the join so they stay sequential.
+    """
+    global _process_pool
+
+    # Resolve the Punkt model (and download its data) once, here, rather
+    # than concurrently inside each worker
+    load_sentence_tokenizer()
+
+    workers = min(len(file_paths), (os.cpu_count() or 1) - 1)
+    if (
+        workers >= 2
+        and len(file_paths) >= _MIN_PARALLEL_FILES
+        and sum(p.stat().st_size for p in file_paths) >= _MIN_PARALLEL_BYTES
+    ):
+        # The pool is shared across runs, so leaving the block must not shut it down
+        executor = nullcontext(_get_process_pool())
+        batch = max(1, len(file_paths) // (workers * 4))
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(_MAX_READ_THREADS, len(file_paths)))
+        batch = 1
+
+    input_token_count = 0
+    all_chunks: list[Chunk] = []
+    with executor as ex:
+        try:
+            for tokens, chunks in ex.map(
+                read_and_chunk, file_paths, repeat(chunk_size), chunksize=batch
+            ):
+                input_token_count += tokens
+                for chunk in chunks:
+                    chunk.id = len(all_chunks)
+                    all_chunks.append(chunk)
+        except BrokenProcessPool:
+            # A dead worker poisons the pool; start a fresh one next run
+            _process_pool = None
+            raise
+    return input_token_count, all_chunks
+
+
+def _embed_chunks(
+    chunks: list[Chunk], config: PipelineConfig, cache: EmbeddingCache | None
+) -> np.ndarray:
+    """Embed chunks, running the encoder only on texts missing from the cache.
+
+    The encoder is not even loaded when every chunk is a cache hit.
+    """
+    texts = [c.text for c in chunks]
+    if cache is not None:
+        hits, misses = cache.get_many(texts)
+    else:
+        hits, misses = {}, list(range(len(chunks)))
+
+    if not misses:
+        return np.stack([hits[i] for i in range(len(chunks))])
+
+    encoder = load_encoder(config)
+    encoded = encode_chunks(
+        [chunks[i] for i in misses], encoder, config.embedding_batch_size
+    )
+    if cache is not None:
+        cache.put_many([texts[i] for i in misses], encoded)
+
+    embeddings = np.empty((len(chunks), encoded.shape[1]), dtype=np.float32)
+    embeddings[misses] = encoded
+    for i, vec in hits.items():
+        embeddings[i] = vec
+    return embeddings
+
+
+def run_pipeline(
+    input_paths: list[str],
+    config: PipelineConfig,
+    cache: EmbeddingCache | None = None,
+) -> PipelineResult:
+    """Execute the full compression pipeline.
+
+    Pass an open EmbeddingCache to share it across runs; otherwise the one
+    configured in config is opened for this run only.
+    """
     console = Console()
 
     with Progress(
@@ -44,32 +162,13 @@ def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResu
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        # 1. Read files
-        task = progress.add_task("Reading markdown files...", total=None)
-        source_files = read_files(input_paths)
-        if not source_files:
+        # 1-3. Read, clean and chunk
+        task = progress.add_task("Reading and chunking markdown...", total=None)
+        file_paths = discover_files(input_paths)
+        if not file_paths:
             console.print("[red]No markdown files found.[/red]")
             raise SystemExit(1)
-        progress.update(task, description=f"Read {len(source_files)} files")
-        progress.remove_task(task)
-
-        # Calculate input tokens
-        input_token_count = sum(estimate_tokens(sf.body) for sf in source_files)
-
-        # 2. Clean
-        task = progress.add_task("Cleaning markdown...", total=None)
-        for sf in source_files:
-            sf.body = clean_markdown(sf.body)
-        progress.remove_task(task)
-
-        # 3. Chunk
-        task = progress.add_task("Chunking into semantic blocks...", total=None)
-        all_chunks = []
-        chunk_id = 0
-        for sf in source_files:
-            chunks = chunk_text(sf.body, sf.path, config.chunk_size, chunk_id)
-            all_chunks.extend(chunks)
-            chunk_id += len(chunks)
+        input_token_count, all_chunks = _ingest_files(file_paths, config.chunk_size)
         total_chunks = len(all_chunks)
         progress.update(task, description=f"Created {total_chunks} chunks")
         progress.remove_task(task)
@@ -80,9 +179,15 @@ def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResu
 
         # 4. Encode
         task = progress.add_task("Computing embeddings...", total=None)
-        encoder = load_encoder(config)
-        embeddings = encode_chunks(all_chunks, encoder)
-        similarity_matrix = build_similarity_matrix(embeddings)
+        run_cache = cache if cache is not None else open_embedding_cache(config)
+        try:
+            embeddings = _embed_chunks(all_chunks, config, run_cache)
+        finally:
+            if cache is None and run_cache is not None:
+                run_cache.close()
+        similarity_matrix = build_similarity_matrix(
+            embeddings, config.similarity_dtype, config.device
+        )
         progress.remove_task(task)
 
         # 5. Deduplicate
@@ -94,25 +199,21 @@ def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResu
         )
         progress.remove_task(task)
 
-        # Rebuild embeddings/similarity for unique chunks only
+        # Slice embeddings/similarity down to unique chunks (chunk ids are
+        # row indices into the full matrices)
         if len(unique_chunks) < total_chunks:
-            unique_indices = [c.id for c in unique_chunks]
-            # Re-index: build a new similarity matrix from the original
-            idx_map = {orig_id: i for i, orig_id in enumerate(range(len(all_chunks)))}
-            sel = [idx_map[c.id] for c in unique_chunks if c.id in idx_map]
-            if sel:
-                unique_embeddings = embeddings[sel]
-                unique_sim = build_similarity_matrix(unique_embeddings)
-            else:
-                unique_embeddings = embeddings
-                unique_sim = similarity_matrix
+            sel = np.fromiter(
+                (c.id for c in unique_chunks), dtype=np.intp, count=len(unique_chunks)
+            )
+            unique_embeddings = embeddings[sel]
+            unique_sim = similarity_matrix[np.ix_(sel, sel)]
         else:
             unique_embeddings = embeddings
             unique_sim = similarity_matrix
 
         # 6. Cluster
         task = progress.add_task("Clustering topics...", total=None)
-        clusters = cluster_chunks(unique_chunks, unique_sim, config)
+        clusters = cluster_chunks(unique_chunks, unique_sim, config, unique_embeddings)
         progress.update(task, description=f"Found {len(clusters)} topics")
         progress.remove_task(task)
 
@@ -122,9 +223,9 @@ def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResu
         progress.remove_task(task)
 
         task = progress.add_task("Summarizing clusters...", total=None)
-        for cluster in clusters:
-            cluster.summary = summarize_cluster(cluster, summarizer, config)
-            progress.update(task, description=f"Summarized: {cluster.label}")
+        summaries = batch_summarize_clusters(clusters, summarizer, config)
+        for cluster, summary in zip(clusters, summaries):
+            cluster.summary = summary
         progress.remove_task(task)
 
         # 8. Extract facts
@@ -144,9 +245,9 @@ def run_pipeline(input_paths: list[str], config: PipelineConfig) -> PipelineResu
         overview=overview,
         clusters=clusters,
         input_token_count=input_token_count,
-        output_token_count=0,  # will be calculated after formatting
-        file_count=len(source_files),
+        file_count=len(file_paths),
     )
+    tiered.output_token_count = estimate_rendered_tokens(tiered)
 
     return PipelineResult(
         output=tiered,
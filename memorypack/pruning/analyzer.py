@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from memorypack.models import Cluster, TieredOutput
+from memorypack.tokencount import count_words
 
 
 def score_clusters(output: TieredOutput) -> dict[int, float]:
@@ -21,22 +21,26 @@ def score_clusters(output: TieredOutput) -> dict[int, float]:
     if not output.clusters:
         return {}
 
-    raw_scores: dict[int, float] = {}
-    max_facts = max(len(c.facts) for c in output.clusters) or 1
-    max_words = max(len(c.summary.split()) for c in output.clusters) or 1
+    n = len(output.clusters)
+    fact_counts = np.fromiter(
+        (len(c.facts) for c in output.clusters), dtype=np.float64, count=n
+    )
+    word_counts = np.fromiter(
+        (count_words(c.summary) for c in output.clusters), dtype=np.float64, count=n
+    )
 
-    for cluster in output.clusters:
-        fact_score = len(cluster.facts) / max_facts
-        summary_score = len(cluster.summary.split()) / max_words
-        raw_scores[cluster.id] = 0.6 * fact_score + 0.4 * summary_score
+    fact_scores = fact_counts / max(fact_counts.max(), 1)
+    summary_scores = word_counts / max(word_counts.max(), 1)
+    raw_scores = 0.6 * fact_scores + 0.4 * summary_scores
 
-    return raw_scores
+    return dict(zip((c.id for c in output.clusters), raw_scores.tolist()))
 
 
 def find_near_duplicates(
     output: TieredOutput,
     encoder: SentenceTransformer,
     threshold: float = 0.80,
+    batch_size: int = 64,
 ) -> list[tuple[int, int, float]]:
     """Detect near-duplicate cluster pairs via summary embedding similarity.
 
@@ -48,15 +52,20 @@ def find_near_duplicates(
         return []
 
     summaries = [c.summary for c in output.clusters]
-    embeddings = encoder.encode(summaries, show_progress_bar=False, convert_to_numpy=True)
-    sim_matrix = cosine_similarity(embeddings)
-
-    duplicates: list[tuple[int, int, float]] = []
-    for i in range(len(output.clusters)):
-        for j in range(i + 1, len(output.clusters)):
-            if sim_matrix[i][j] >= threshold:
-                duplicates.append(
-                    (output.clusters[i].id, output.clusters[j].id, float(sim_matrix[i][j]))
-                )
-
-    return duplicates
+    # Unit-norm vectors make cosine similarity a single SGEMM
+    embeddings = encoder.encode(
+        summaries,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    ).astype(np.float32, copy=False)
+    sim_matrix = embeddings @ embeddings.T
+
+    # Upper-triangle pairs in row-major order, filtered with one mask
+    ids = np.fromiter((c.id for c in output.clusters), dtype=np.int64, count=len(summaries))
+    rows, cols = np.triu_indices(len(summaries), k=1)
+    sims = sim_matrix[rows, cols]
+    mask = sims >= threshold
+
+    return list(zip(ids[rows[mask]].tolist(), ids[cols[mask]].tolist(), sims[mask].tolist()))
@@ -7,6 +7,13 @@ from pathlib import Path
 
 from memorypack.models import Cluster, TieredOutput
 
+_TOPIC_RE = re.compile(r"^# Knowledge Base:\s*(.+)$", re.MULTILINE)
+_META_RE = re.compile(r"(\d[\d,]*)\s*→\s*(\d[\d,]*)\s*tokens")
+_FILE_COUNT_RE = re.compile(r"(\d+)\s*files")
+_OVERVIEW_RE = re.compile(r"## Overview\n(.*?)(?=\n## )", re.DOTALL)
+_TOPICS_RE = re.compile(r"## Topics\n(.*?)(?=\n## |\Z)", re.DOTALL)
+_FACTS_RE = re.compile(r"## Facts\n(.*?)(?=\n## |\Z)", re.DOTALL)
+
 
 def parse_knowledge_base(path: str) -> TieredOutput:
     """Parse a memorypack knowledge_base.md file into TieredOutput.
@@ -30,35 +37,29 @@ def parse_knowledge_base(path: str) -> TieredOutput:
     text = Path(path).read_text(encoding="utf-8")
 
     # Extract topic from header
-    topic_match = re.search(r"^# Knowledge Base:\s*(.+)$", text, re.MULTILINE)
+    topic_match = _TOPIC_RE.search(text)
     topic = topic_match.group(1).strip() if topic_match else "Knowledge Base"
 
     # Extract token counts from the blockquote
-    meta_match = re.search(
-        r"(\d[\d,]*)\s*→\s*(\d[\d,]*)\s*tokens", text
-    )
+    meta_match = _META_RE.search(text)
     input_tokens = int(meta_match.group(1).replace(",", "")) if meta_match else 0
     output_tokens = int(meta_match.group(2).replace(",", "")) if meta_match else 0
 
-    file_count_match = re.search(r"(\d+)\s*files", text)
+    file_count_match = _FILE_COUNT_RE.search(text)
     file_count = int(file_count_match.group(1)) if file_count_match else 0
 
     # Split into major sections
     overview = ""
-    overview_match = re.search(
-        r"## Overview\n(.*?)(?=\n## )", text, re.DOTALL
-    )
+    overview_match = _OVERVIEW_RE.search(text)
     if overview_match:
         overview = overview_match.group(1).strip()
 
     # Parse topic summaries
     clusters: dict[str, Cluster] = {}
-    topics_match = re.search(
-        r"## Topics\n(.*?)(?=\n## |\Z)", text, re.DOTALL
-    )
+    topics_match = _TOPICS_RE.search(text)
     if topics_match:
         topics_text = topics_match.group(1)
-        topic_blocks = re.split(r"### ", topics_text)
+        topic_blocks = topics_text.split("### ")
         for i, block in enumerate(topic_blocks):
             block = block.strip()
             if not block:
@@ -71,12 +72,10 @@ def parse_knowledge_base(path: str) -> TieredOutput:
             )
 
     # Parse facts
-    facts_match = re.search(
-        r"## Facts\n(.*?)(?=\n## |\Z)", text, re.DOTALL
-    )
+    facts_match = _FACTS_RE.search(text)
     if facts_match:
         facts_text = facts_match.group(1)
-        fact_blocks = re.split(r"### ", facts_text)
+        fact_blocks = facts_text.split("### ")
         for block in fact_blocks:
             block = block.strip()
             if not block:
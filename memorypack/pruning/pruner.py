@@ -2,32 +2,34 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+
 from sentence_transformers import SentenceTransformer
 
 from memorypack.config import PruneConfig
 from memorypack.models import Cluster, PruneResult, TieredOutput
 from memorypack.pruning.analyzer import find_near_duplicates, score_clusters
-from memorypack.tokencount import estimate_tokens
+from memorypack.tokencount import count_words, estimate_tokens, words_to_tokens
+
 
+def _merge_into(keep: Cluster, keep_facts: set[str], remove: Cluster) -> None:
+    """Merge remove into keep in place, combining facts and keeping the longer summary.
 
-def _merge_clusters(keep: Cluster, remove: Cluster) -> Cluster:
-    """Merge two clusters, combining facts and keeping the longer summary."""
-    merged_facts = list(keep.facts)
-    existing = set(keep.facts)
+    keep_facts mirrors keep.facts as a set and is updated alongside it.
+    """
     for fact in remove.facts:
-        if fact not in existing:
-            merged_facts.append(fact)
-
-    summary = keep.summary if len(keep.summary) >= len(remove.summary) else remove.summary
-    label = keep.label
-
-    return Cluster(
-        id=keep.id,
-        label=label,
-        summary=summary,
-        facts=merged_facts,
-        chunks=keep.chunks + remove.chunks,
-    )
+        if fact not in keep_facts:
+            keep_facts.add(fact)
+            keep.facts.append(fact)
+
+    if len(remove.summary) > len(keep.summary):
+        keep.summary = remove.summary
+    keep.chunks.extend(remove.chunks)
+
+
+def _cluster_words(cluster: Cluster) -> int:
+    """Word count of a cluster's summary and facts."""
+    return count_words(cluster.summary) + sum(count_words(f) for f in cluster.facts)
 
 
 def _estimate_output_tokens(output: TieredOutput) -> int:
@@ -59,13 +61,16 @@ def prune(
 
     # Step 1: Merge near-duplicates if enabled and encoder is available
     if config.merge_duplicates and encoder is not None:
-        duplicates = find_near_duplicates(output, encoder, config.similarity_threshold)
+        duplicates = find_near_duplicates(
+            output, encoder, config.similarity_threshold, config.embedding_batch_size
+        )
 
         # Sort by similarity descending — merge most similar first
         duplicates.sort(key=lambda x: x[2], reverse=True)
 
         cluster_map = {c.id: c for c in output.clusters}
         removed_ids: set[int] = set()
+        fact_sets: dict[int, set[str]] = {}
 
         for id_a, id_b, _sim in duplicates:
             if id_a in removed_ids or id_b in removed_ids:
@@ -76,9 +81,17 @@ def prune(
             else:
                 keep_id, remove_id = id_b, id_a
 
+            if keep_id not in fact_sets:
+                # Copy once; further merges into this cluster extend it in place
+                keep = cluster_map[keep_id]
+                cluster_map[keep_id] = replace(
+                    keep, facts=list(keep.facts), chunks=list(keep.chunks)
+                )
+                fact_sets[keep_id] = set(keep.facts)
+
             keep = cluster_map[keep_id]
             remove = cluster_map[remove_id]
-            cluster_map[keep_id] = _merge_clusters(keep, remove)
+            _merge_into(keep, fact_sets[keep_id], remove)
             removed_ids.add(remove_id)
             merged_pairs.append((keep.label, remove.label))
 
@@ -100,11 +113,24 @@ def prune(
 
     # Step 3: Remove lowest-importance clusters to meet token budget
     if config.max_tokens > 0:
-        while _estimate_output_tokens(output) > config.max_tokens and len(output.clusters) > 1:
-            # Find and remove the least important remaining cluster
-            worst = min(output.clusters, key=lambda c: scores.get(c.id, 0))
+        # Word counts are additive over the newline-joined parts, so track
+        # the total and subtract each removed cluster instead of re-joining
+        cluster_words = {c.id: _cluster_words(c) for c in output.clusters}
+        total_words = count_words(output.overview) + sum(cluster_words.values())
+        # Stable sort: ties go in output order, same as repeated min()
+        worst_first = iter(sorted(output.clusters, key=lambda c: scores.get(c.id, 0)))
+        removed: set[int] = set()
+        while (
+            words_to_tokens(total_words) > config.max_tokens
+            and len(output.clusters) - len(removed) > 1
+        ):
+            # Remove the least important remaining cluster
+            worst = next(worst_first)
             removed_labels.append(worst.label)
-            output.clusters = [c for c in output.clusters if c.id != worst.id]
+            removed.add(worst.id)
+            total_words -= cluster_words[worst.id]
+        if removed:
+            output.clusters = [c for c in output.clusters if c.id not in removed]
 
     final_tokens = _estimate_output_tokens(output)
 
@@ -6,51 +6,61 @@ import re
 
 from memorypack.models import Cluster
 
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_MD_RE = re.compile(r"[*_`~]")
+_BULLET_RE = re.compile(r"^[\s\-\d.)+]+")
+# Whitespace then an uppercase letter (a capitalized later word), or a digit
+_SIGNAL_RE = re.compile(r"\s[A-Z]|[0-9]")
+# Vague/transitional openers and context-dependent references. No trailing
+# \b: these are prefix matches, like str.startswith.
+_VAGUE_RE = re.compile(
+    r"this is|it is important|note that|please|for example|in other words"
+    r"|basically|this approach|this allows|this process|this produces"
+    r"|this makes|this suggests|these allow|these models|several approaches"
+    r"|the process|the key|in practice"
+    r"|it |they |its |their ",
+    re.IGNORECASE,
+)
+
 
 def _split_into_sentences(text: str) -> list[str]:
     """Simple sentence splitter (avoids loading NLTK again)."""
-    # Split on sentence-ending punctuation followed by space or end
-    parts = re.split(r"(?<=[.!?])\s+", text)
-    return [p.strip() for p in parts if p.strip()]
+    # Split on whitespace runs after sentence-ending punctuation. With the
+    # ends stripped first, every part is already trimmed and non-empty
+    # (each ends in the punctuation), unless the text itself was blank.
+    parts = _SENT_SPLIT_RE.split(text.strip())
+    return parts if parts[0] else []
 
 
 def _is_factual(sentence: str) -> bool:
     """Heuristic: is this sentence likely a factual statement?"""
     sentence = sentence.strip()
-    if len(sentence) < 15:
-        return False
-    # Skip questions
-    if sentence.endswith("?"):
-        return False
-    # Skip very vague or transitional statements
-    vague_starts = ("this is", "it is important", "note that", "please",
-                    "for example", "in other words", "basically",
-                    "this approach", "this allows", "this process",
-                    "this produces", "this makes", "this suggests",
-                    "these allow", "these models", "several approaches",
-                    "the process", "the key", "in practice")
-    lower = sentence.lower()
-    if any(lower.startswith(v) for v in vague_starts):
+    # Skip short sentences and questions
+    if len(sentence) < 15 or sentence.endswith("?"):
         return False
-    # Skip sentences that are just context-dependent references
-    if lower.startswith(("it ", "they ", "its ", "their ")):
+    # Skip vague/transitional statements and context-dependent references
+    if _VAGUE_RE.match(sentence):
         return False
-    # Prefer sentences with proper nouns or technical terms (contain uppercase mid-sentence)
+    # Sentences of up to three words need no further evidence
+    if len(sentence.split(maxsplit=3)) < 4:
+        return True
+    # Prefer sentences with proper nouns or technical terms (a later word
+    # starting uppercase) or numbers
+    if sentence.isascii():
+        return _SIGNAL_RE.search(sentence) is not None
+    # Non-ASCII: str methods apply the full Unicode case and digit rules
     words = sentence.split()
-    if len(words) > 3:
-        has_technical_term = any(w[0].isupper() and i > 0 for i, w in enumerate(words) if w[0].isalpha())
-        has_number = any(c.isdigit() for c in sentence)
-        if not has_technical_term and not has_number:
-            return False
-    return True
+    return any(w[0].isalpha() and w[0].isupper() for w in words[1:]) or any(
+        c.isdigit() for c in sentence
+    )
 
 
 def _clean_fact(sentence: str) -> str:
     """Clean a sentence into a concise fact."""
     # Remove markdown formatting
-    fact = re.sub(r"[*_`~]", "", sentence)
+    fact = _MD_RE.sub("", sentence)
     # Remove leading bullets/numbers
-    fact = re.sub(r"^[\s\-\d.)+]+", "", fact)
+    fact = _BULLET_RE.sub("", fact)
     # Strip heading markers
     fact = fact.lstrip("#").strip()
     # Capitalize first letter
@@ -76,8 +86,8 @@ def extract_facts(cluster: Cluster) -> list[str]:
         fact = _clean_fact(sentence)
         if not fact or len(fact) < 15:
             continue
-        # Deduplicate within cluster
-        normalized = fact.lower().strip()
+        # Deduplicate within cluster (_clean_fact already stripped it)
+        normalized = fact.lower()
         if normalized not in seen:
             seen.add(normalized)
             facts.append(fact)
@@ -9,21 +9,64 @@ logging.getLogger("transformers").setLevel(logging.ERROR)
 warnings.filterwarnings("ignore", message=".*max_length.*input_length.*")
 warnings.filterwarnings("ignore", message=".*truncate to max_length.*")
 
+import torch
+from transformers import AutoTokenizer
 from transformers import pipeline as hf_pipeline
 
 from memorypack.config import PipelineConfig
+from memorypack.modelcache import ModelCache
 from memorypack.models import Cluster
-from memorypack.tokencount import estimate_tokens
+from memorypack.tokencount import count_words, estimate_tokens, words_to_tokens
+
+_summarizers: ModelCache = ModelCache()
+
+
+def _load_onnx_seq2seq(config: PipelineConfig):
+    """Load the summarization model under ONNX Runtime, exporting it once."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    provider = (
+        "CUDAExecutionProvider"
+        if config.device.startswith("cuda")
+        else "CPUExecutionProvider"
+    )
+    model_dir = config.onnx_model_dir(config.summarization_model)
+    if model_dir.exists():
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_dir, provider=provider)
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    else:
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            config.summarization_model, export=True, provider=provider
+        )
+        tokenizer = AutoTokenizer.from_pretrained(config.summarization_model)
+        model.save_pretrained(model_dir)
+        tokenizer.save_pretrained(model_dir)
+    return model, tokenizer
 
 
 def load_summarizer(config: PipelineConfig):
-    """Load the BART summarization pipeline."""
-    return hf_pipeline(
+    """Return the configured summarization pipeline, reusing a loaded one."""
+    key = (config.summarization_model, config.device, config.backend)
+    return _summarizers.get(key, lambda: _load_summarizer(config))
+
+
+def _load_summarizer(config: PipelineConfig):
+    """Load the BART summarization pipeline on the configured backend."""
+    if config.backend == "onnx":
+        model, tokenizer = _load_onnx_seq2seq(config)
+        return hf_pipeline("summarization", model=model, tokenizer=tokenizer)
+
+    summarizer = hf_pipeline(
         "summarization",
         model=config.summarization_model,
         device=(-1 if config.device == "cpu" else 0),
         framework="pt",
     )
+    if config.backend == "torch.compile":
+        # generate() calls forward once per decoding step
+        model = summarizer.model
+        model.forward = torch.compile(model.forward, dynamic=True)
+    return summarizer
 
 
 def _chunk_for_bart(text: str, max_tokens: int = 900) -> list[str]:
@@ -54,67 +97,109 @@ def _chunk_for_bart(text: str, max_tokens: int = 900) -> list[str]:
     return segments if segments else [text[:3000]]
 
 
+def _summarize_batch(
+    summarizer, texts: list[str], config: PipelineConfig, min_length: int
+) -> list[str]:
+    """Summarize many texts in one pipeline call, returned in input order.
+
+    Inputs are fed longest first so each padded batch holds similar lengths.
+    """
+    if not texts:
+        return []
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    results = summarizer(
+        [texts[i] for i in order],
+        batch_size=config.summary_batch_size,
+        max_length=config.summary_max_tokens,
+        min_length=min_length,
+        do_sample=False,
+        truncation=True,
+    )
+    summaries = [""] * len(texts)
+    for i, result in zip(order, results):
+        summaries[i] = result["summary_text"]
+    return summaries
+
+
+def _summarize_segments(
+    summarizer, texts: dict[int, str], config: PipelineConfig
+) -> dict[int, list[str]]:
+    """Split each text for BART and summarize all segments in one batch."""
+    segments: list[str] = []
+    owners: list[int] = []
+    for key, text in texts.items():
+        for segment in _chunk_for_bart(text):
+            segments.append(segment)
+            owners.append(key)
+
+    parts: dict[int, list[str]] = {key: [] for key in texts}
+    for key, summary in zip(owners, _summarize_batch(summarizer, segments, config, 20)):
+        parts[key].append(summary)
+    return parts
+
+
+def batch_summarize_clusters(
+    clusters: list[Cluster], summarizer, config: PipelineConfig
+) -> list[str]:
+    """Hierarchically summarize every cluster, batching across clusters.
+
+    Clusters that fit BART's input are summarized in one pass. Larger ones
+    are split into segments, the segments of all clusters are summarized
+    together, and the merged intermediate summaries are reduced in a
+    second batched round. Merged summaries that still exceed the input
+    limit are truncated by BART in that round, unless
+    config.hierarchical_full_reduce asks for another segmenting pass.
+    """
+    summaries = [""] * len(clusters)
+    single: dict[int, str] = {}
+    oversized: dict[int, str] = {}
+    for i, cluster in enumerate(clusters):
+        combined = " ".join(c.text for c in cluster.chunks)
+        # Words add up across the space-joined chunks; no need to re-split
+        words = sum(
+            count_words(c.text) if c.word_count is None else c.word_count
+            for c in cluster.chunks
+        )
+        if words_to_tokens(words) <= 900:
+            single[i] = combined
+        else:
+            oversized[i] = combined
+
+    # Fits in one pass
+    results = _summarize_batch(summarizer, list(single.values()), config, 30)
+    for i, summary in zip(single, results):
+        summaries[i] = summary
+
+    # Hierarchical: summarize segments, then summarize summaries
+    merged: dict[int, str] = {}
+    to_reduce: dict[int, str] = {}
+    for i, parts in _summarize_segments(summarizer, oversized, config).items():
+        text = " ".join(parts)
+        if config.hierarchical_full_reduce and estimate_tokens(text) > 900:
+            # Need another round to keep the tail
+            to_reduce[i] = text
+        else:
+            merged[i] = text
+
+    results = _summarize_batch(summarizer, list(merged.values()), config, 30)
+    for i, summary in zip(merged, results):
+        summaries[i] = summary
+
+    for i, parts in _summarize_segments(summarizer, to_reduce, config).items():
+        summaries[i] = " ".join(parts)
+
+    return summaries
+
+
 def summarize_cluster(
     cluster: Cluster, summarizer, config: PipelineConfig
 ) -> str:
-    """Hierarchically summarize a cluster's chunks.
+    """Hierarchically summarize a single cluster's chunks.
 
     If combined text exceeds BART's input limit, summarize segments
     first, then summarize the summaries.
     """
-    combined = " ".join(c.text for c in cluster.chunks)
-    total_tokens = estimate_tokens(combined)
-
-    if total_tokens <= 900:
-        # Fits in one pass
-        result = summarizer(
-            combined,
-            max_length=config.summary_max_tokens,
-            min_length=30,
-            do_sample=False,
-            truncation=True,
-        )
-        return result[0]["summary_text"]
-
-    # Hierarchical: summarize segments, then summarize summaries
-    segments = _chunk_for_bart(combined)
-    intermediate_summaries: list[str] = []
-
-    for segment in segments:
-        result = summarizer(
-            segment,
-            max_length=config.summary_max_tokens,
-            min_length=20,
-            do_sample=False,
-            truncation=True,
-        )
-        intermediate_summaries.append(result[0]["summary_text"])
-
-    # Combine intermediate summaries
-    merged = " ".join(intermediate_summaries)
-    if estimate_tokens(merged) > 900:
-        # Need another round
-        segments = _chunk_for_bart(merged)
-        final_parts = []
-        for segment in segments:
-            result = summarizer(
-                segment,
-                max_length=config.summary_max_tokens,
-                min_length=20,
-                do_sample=False,
-                truncation=True,
-            )
-            final_parts.append(result[0]["summary_text"])
-        return " ".join(final_parts)
-
-    result = summarizer(
-        merged,
-        max_length=config.summary_max_tokens,
-        min_length=30,
-        do_sample=False,
-        truncation=True,
-    )
-    return result[0]["summary_text"]
+    return batch_summarize_clusters([cluster], summarizer, config)[0]
 
 
 def generate_overview(
@@ -5,9 +5,19 @@ from __future__ import annotations
 _WORD_TOKEN_RATIO = 1.3
 
 
+def count_words(text: str) -> int:
+    """Number of whitespace-separated words in text."""
+    return len(text.split())
+
+
+def words_to_tokens(word_count: int) -> int:
+    """Convert a word count into the estimate_tokens heuristic."""
+    return int(word_count * _WORD_TOKEN_RATIO)
+
+
 def estimate_tokens(text: str) -> int:
     """Fast heuristic: words * 1.3."""
-    return int(len(text.split()) * _WORD_TOKEN_RATIO)
+    return words_to_tokens(count_words(text))
 
 
 def count_tokens_precise(text: str) -> int:
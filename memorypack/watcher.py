@@ -1,21 +1,61 @@
-"""File watcher — polls for .md changes, re-runs compress, auto-prunes."""
+"""File watcher — reacts to .md changes, re-runs compress, auto-prunes."""
 
 from __future__ import annotations
 
+import os
+import queue
 import time
 from pathlib import Path
 
 from rich.console import Console
 
 from memorypack.config import PipelineConfig, PruneConfig
+from memorypack.embedding.cache import open_embedding_cache
+from memorypack.embedding.encoder import load_encoder
+from memorypack.models import TieredOutput
 from memorypack.output.formatter import render_single
-from memorypack.output.writer import write_output
+from memorypack.output.writer import OUTPUT_FILENAMES, write_output
 from memorypack.pipeline import run_pipeline
-from memorypack.tokencount import estimate_tokens
+from memorypack.summarization.summarizer import load_summarizer
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional: pip install memorypack[watch]
+    Observer = None
+
+_DEBOUNCE_SECONDS = 0.5
+_CHANGE_EVENTS = frozenset({"created", "modified", "deleted", "moved"})
+
+
+class _MarkdownEventHandler:
+    """watchdog handler that signals a queue on any .md file change."""
+
+    def __init__(self, events: queue.Queue, output_dir: str) -> None:
+        self.events = events
+        # Our own writes must not retrigger a run if output sits in input
+        self.ignore_paths = frozenset(
+            os.path.abspath(os.path.join(output_dir, name)) for name in OUTPUT_FILENAMES
+        )
+
+    def dispatch(self, event) -> None:
+        if event.is_directory or event.event_type not in _CHANGE_EVENTS:
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if (
+                path
+                and path.endswith(".md")
+                and os.path.abspath(path) not in self.ignore_paths
+            ):
+                self.events.put(path)
+                return
 
 
 class MemorypackWatcher:
-    """Polls a directory for .md file changes and re-runs compression."""
+    """Watches a directory for .md file changes and re-runs compression.
+
+    Uses filesystem events via watchdog when installed, otherwise polls
+    file mtimes every interval seconds.
+    """
 
     def __init__(
         self,
@@ -34,6 +74,12 @@ class MemorypackWatcher:
         self.topic = topic
         self.console = Console()
         self._last_mtimes: dict[str, float] = {}
+        self.config = PipelineConfig(device=device, topic=topic)
+        # Opened once and shared by every run, so unchanged chunks are
+        # never re-encoded
+        self._embedding_cache = open_embedding_cache(self.config)
+        # Strong references that keep the shared models loaded between runs
+        self._models: tuple = ()
 
     def _scan_mtimes(self) -> dict[str, float]:
         """Get mtime for all .md files in input directory."""
@@ -57,16 +103,8 @@ class MemorypackWatcher:
             self.console.print("[yellow]No .md files found.[/yellow]")
             return
 
-        config = PipelineConfig(
-            device=self.device,
-            topic=self.topic,
-        )
-
         try:
-            result = run_pipeline(md_files, config)
-
-            rendered = render_single(result.output)
-            result.output.output_token_count = estimate_tokens(rendered)
+            result = run_pipeline(md_files, self.config, self._embedding_cache)
 
             written = write_output(result.output, self.output_dir, "single")
 
@@ -77,21 +115,19 @@ class MemorypackWatcher:
 
             # Auto-prune if over budget
             if self.token_budget > 0 and result.output.output_token_count > self.token_budget:
-                self._auto_prune(written[0])
+                self._auto_prune(result.output, written[0])
 
         except Exception as e:
             self.console.print(f"[red]Compression failed: {e}[/red]")
 
-    def _auto_prune(self, output_path: str) -> None:
-        """Auto-prune if output exceeds token budget."""
-        from memorypack.pruning.parser import parse_knowledge_base
+    def _auto_prune(self, output: TieredOutput, output_path: str) -> None:
+        """Prune the just-written output in memory and overwrite the file."""
         from memorypack.pruning.pruner import prune as run_prune
 
         self.console.print(
             f"[yellow]Over budget ({self.token_budget:,} tokens), auto-pruning...[/yellow]"
         )
 
-        output = parse_knowledge_base(output_path)
         prune_config = PruneConfig(
             max_tokens=self.token_budget,
             device=self.device,
@@ -106,21 +142,65 @@ class MemorypackWatcher:
             f"~{result.output_token_count:,} tokens[/green]"
         )
 
-    def run(self) -> None:
-        """Start the polling loop. Runs until interrupted."""
-        self.console.print(
-            f"Watching [bold]{self.input_dir}[/bold] every {self.interval}s..."
-        )
-
-        # Initial run
+    def _poll(self) -> None:
+        """Run once, then re-scan mtimes every interval seconds."""
         self._last_mtimes = self._scan_mtimes()
         self._run_compress()
-
+        while True:
+            time.sleep(self.interval)
+            if self._has_changes():
+                self.console.print("\n[cyan]Changes detected, recompressing...[/cyan]")
+                self._run_compress()
+
+    def _watch_events(self) -> None:
+        """Run once, then recompress after each settled burst of file events."""
+        events: queue.Queue[str] = queue.Queue()
+        observer = Observer()
+        observer.schedule(
+            _MarkdownEventHandler(events, self.output_dir),
+            str(self.input_dir),
+            recursive=True,
+        )
+        observer.start()
         try:
+            self._run_compress()
             while True:
-                time.sleep(self.interval)
-                if self._has_changes():
-                    self.console.print("\n[cyan]Changes detected, recompressing...[/cyan]")
-                    self._run_compress()
+                try:
+                    # Timeout only keeps the loop responsive to Ctrl-C
+                    events.get(timeout=self.interval)
+                except queue.Empty:
+                    continue
+                # Editors save in bursts; wait until events stop arriving
+                while True:
+                    try:
+                        events.get(timeout=_DEBOUNCE_SECONDS)
+                    except queue.Empty:
+                        break
+                self.console.print("\n[cyan]Changes detected, recompressing...[/cyan]")
+                self._run_compress()
+        finally:
+            observer.stop()
+            observer.join()
+
+    def run(self) -> None:
+        """Start watching. Runs until interrupted."""
+        if Observer is not None:
+            self.console.print(f"Watching [bold]{self.input_dir}[/bold] for changes...")
+        else:
+            self.console.print(
+                f"Watching [bold]{self.input_dir}[/bold] every {self.interval}s..."
+            )
+
+        try:
+            # Load models up front so no change waits on a cold start
+            self.console.print("Loading models...")
+            self._models = (load_encoder(self.config), load_summarizer(self.config))
+            if Observer is not None:
+                self._watch_events()
+            else:
+                self._poll()
         except KeyboardInterrupt:
             self.console.print("\n[yellow]Watch stopped.[/yellow]")
+        finally:
+            if self._embedding_cache is not None:
+                self._embedding_cache.close()